@@ -11,8 +11,9 @@ python -m fs.bench --dirs 200 --files 500 \
 That command will:
 
 1. Create 200 top‑level directories `/dir_000 … /dir_199`.
-2. Inside each, create up to 500 files `file_<n>.bin` with random 256‑B payloads.
-3. Time *ops* random look‑ups / reads.
+2. Inside each, create up to 500 files `file_<n>.bin` with random 256‑B payloads
+   (sliced from one `os.urandom` blob per directory).
+3. Time *ops* random look‑ups / reads in blocks of ``--block``.
 4. Print summary statistics.
 
 The default parameters stay small so it finishes fast; tweak them on the CLI.
@@ -26,7 +27,6 @@ import random
 import statistics as stats
 import string
 import time
-from pathlib import PurePosixPath
 
 from rich.console import Console
 from rich.table import Table
@@ -35,6 +35,8 @@ from . import persist
 from .vfs import VFS
 
 RND = random.Random(42)
+PAYLOAD = 256  # bytes per generated file
+MIN_SAMPLES = 20  # fewest timing samples that still give a real p95
 console = Console()
 
 
@@ -46,32 +48,60 @@ def _rand_name(prefix: str, length: int = 6) -> str:
     return f"{prefix}_{body}"
 
 
-def populate(vfs: VFS, n_dirs: int, n_files: int):
-    """Create n_dirs top‑level dirs, each with up to n_files random files."""
+def populate(vfs: VFS, n_dirs: int, n_files: int) -> list[str]:
+    """
+    Create n_dirs top‑level dirs, each with up to n_files random files.
+    Returns the created file paths so callers needn't walk the tree again.
+    """
+    paths: list[str] = []
     for d in range(n_dirs):
-        dir_path = PurePosixPath("/") / f"dir_{d:03d}"
-        vfs.mkdir(str(dir_path))
-        for f in range(n_files):
-            name = _rand_name("file")
-            full = dir_path / f"{name}.bin"
-            data = os.urandom(256)
-            vfs.write(str(full), data)
-
-
-def time_random_reads(vfs: VFS, ops: int) -> list[float]:
-    """Pick random files and measure read latency in µs."""
-    paths = []
+        dir_path = f"/dir_{d:03d}"
+        blob = os.urandom(PAYLOAD * n_files)     # one syscall per directory
+        files = [
+            (f"{_rand_name('file')}.bin", blob[off : off + PAYLOAD])
+            for off in range(0, len(blob), PAYLOAD)
+        ]
+        vfs.bulk_create([(dir_path, files)])
+        paths.extend(["/".join((dir_path, name)) for name, _ in files])
+    return paths
+
+
+def collect_paths(vfs: VFS) -> list[str]:
+    """All ``/<dir>/<file>`` paths, for a VFS loaded from a snapshot."""
+    paths: list[str] = []
     for dir_name, dir_inode_id in vfs.table.get(vfs.root_id).children.items():
+        prefix = "/" + dir_name
         dir_node = vfs.table.get(dir_inode_id)
-        for fname in dir_node.children:
-            paths.append(f"/{dir_name}/{fname}")
+        paths.extend(["/".join((prefix, fname)) for fname in dir_node.children])
+    return paths
+
+
+def time_random_reads(
+    vfs: VFS, ops: int, block: int = 100, paths: list[str] | None = None
+) -> list[float]:
+    """
+    Pick random files and measure read latency in µs.
+
+    Reads are timed in blocks of *block* and each sample is the block's
+    per‑read mean, so two clock calls don't dwarf a sub‑µs read.  A short
+    trailing block is timed too, so every read is measured.
+    *paths* defaults to every file in the tree (see `collect_paths`).
+    """
+    if paths is None:
+        paths = collect_paths(vfs)
+
+    block = max(1, block)
+    picks = RND.choices(paths, k=ops)
+    read = vfs.read
+    clock = time.perf_counter_ns
 
     t_samples: list[float] = []
-    for _ in range(ops):
-        p = RND.choice(paths)
-        t0 = time.perf_counter()
-        vfs.read(p)
-        t_samples.append((time.perf_counter() - t0) * 1e6)  # µs
+    for start in range(0, ops, block):
+        batch = picks[start : start + block]
+        t0 = clock()
+        for p in batch:
+            read(p)
+        t_samples.append((clock() - t0) / len(batch) / 1e3)  # µs per read
     return t_samples
 
 
@@ -83,11 +113,17 @@ def main():
     ap.add_argument("--dirs", type=int, default=50, help="# top‑level dirs")
     ap.add_argument("--files", type=int, default=200, help="# files per dir")
     ap.add_argument("--ops", type=int, default=20_000, help="# random read ops")
+    ap.add_argument("--block", type=int, default=100, help="reads per timing sample")
     ap.add_argument("--state", default=".bench_state.pkl.gz", help="snapshot path")
     ap.add_argument("--reuse", action="store_true", help="reuse existing snapshot")
     args = ap.parse_args()
+    if args.ops < MIN_SAMPLES:
+        ap.error(f"--ops must be at least {MIN_SAMPLES}")
+    # shrink blocks so small --ops runs still yield MIN_SAMPLES samples
+    args.block = max(1, min(args.block, args.ops // MIN_SAMPLES))
 
     vfs: VFS
+    paths: list[str] | None = None
     if args.reuse and os.path.exists(args.state):
         console.print(f"[cyan]Loading snapshot from {args.state}[/cyan]")
         vfs = persist.load(args.state)
@@ -97,16 +133,16 @@ def main():
         console.print(
             f"[yellow]Populating {args.dirs} dirs × {args.files} files…[/yellow]"
         )
-        populate(vfs, args.dirs, args.files)
+        paths = populate(vfs, args.dirs, args.files)
         persist.save(vfs, args.state)
         console.print(f"[green]Snapshot saved → {args.state}[/green]")
 
     console.print(
         f"[yellow]Timing {args.ops:_} random reads (µs)…[/yellow]", highlight=False
     )
-    samples = time_random_reads(vfs, args.ops)
+    samples = time_random_reads(vfs, args.ops, args.block, paths)
 
-    tbl = Table(title="Random read latency (µs)")
+    tbl = Table(title=f"Random read latency (µs, {args.block}‑read blocks)")
     tbl.add_column("metric", justify="right")
     tbl.add_column("value", justify="right")
     tbl.add_row("p50", f"{stats.median(samples):,.1f}")
@@ -27,10 +27,11 @@ vfs> quit
 from __future__ import annotations
 
 import argparse
+import atexit
+import posixpath
 import shlex
 import sys
 import subprocess
-from pathlib import PurePosixPath
 
 from . import persist
 from .exceptions import FSException, FileNotFound, NotDirectory
@@ -41,31 +42,39 @@ from .vfs import VFS
 # -------------------------------------------------------------------
 vfs: VFS
 cwd = "/"
+# mutations applied this run, flushed to the snapshot's op log on exit
+_journal: list[tuple[str, tuple]] = []
+
+# compaction snapshots are written in the background; finish before exit
+atexit.register(persist.flush)
 
 
 def _resolve(path: str) -> str:
     """Resolve a user‐entered path against the current working directory."""
-    p = PurePosixPath(path)
-    if p.is_absolute():
-        return str(p)
-    return str(PurePosixPath(cwd) / path)
+    return posixpath.normpath(posixpath.join(cwd, path))
 
 
 # ====================== command handlers ===========================
 
 def _cmd_mkdir(args):
-    vfs.mkdir(_resolve(args.path))
+    path = _resolve(args.path)
+    vfs.mkdir(path)
+    _journal.append(("mkdir", (path,)))
 
 
 def _cmd_touch(args):
-    vfs.touch(_resolve(args.path))
+    path = _resolve(args.path)
+    vfs.touch(path)
+    _journal.append(("touch", (path,)))
 
 
 def _cmd_write(args):
     data = args.data
     if len(data) >= 2 and data[0] == data[-1] and data[0] in {"'", '"'}:
         data = data[1:-1]
-    vfs.write(_resolve(args.path), data)
+    path = _resolve(args.path)
+    vfs.write(path, data)
+    _journal.append(("write", (path, data)))
 
 
 def _cmd_read(args):
@@ -83,7 +92,9 @@ def _cmd_ls(args):
 
 
 def _cmd_rm(args):
-    vfs.rm(_resolve(args.path))
+    path = _resolve(args.path)
+    vfs.rm(path)
+    _journal.append(("rm", (path,)))
 
 
 def _cmd_cd(args):
@@ -117,9 +128,8 @@ def _cmd_repl(_args):
         if line == "help":
             print("Commands: mkdir touch write read ls rm cd open repl quit")
             continue
-        argv = shlex.split(line)
         try:
-            main(argv, preserve_state=True)
+            _dispatch(_PARSER.parse_args(shlex.split(line)))
         except FSException as e:
             print("Error:", e)
         except SystemExit:
@@ -176,24 +186,51 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+# built once: main() and every REPL line share it
+_PARSER = build_parser()
+
+
 # ====================== entry point ================================
 
-def main(argv: list[str] | None = None, *, preserve_state: bool = False):
+def _dispatch(args: argparse.Namespace):
+    """
+    Run the handler argparse selected; shared by main() and the REPL.
+
+    Resolving a path creates missing parent directories (mkdir -p) even
+    for read‑only or failing commands.  When that is the only change a
+    command made, it is journaled as a ``makedirs`` of the parent so the
+    op log replays the same tree.
+    """
+    path = _resolve(args.path) if getattr(args, "path", None) is not None else None
+    n_ops = len(_journal)
+    was_dirty, vfs._dirty = vfs._dirty, False
+    try:
+        args.func(args)
+    finally:
+        if path is not None and vfs._dirty and len(_journal) == n_ops:
+            _journal.append(("makedirs", (posixpath.dirname(path),)))
+        vfs._dirty = vfs._dirty or was_dirty
+
+
+def main(argv: list[str] | None = None):
     global vfs, cwd
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    args = _PARSER.parse_args(argv)
 
-    if not preserve_state:
-        vfs = persist.load(args.state)
+    vfs = persist.load(args.state)
 
     try:
-        args.func(args)
+        _dispatch(args)
     except FSException as e:
         print("Error:", e, file=sys.stderr)
         sys.exit(1)
 
-    if not preserve_state:
-        persist.save(vfs, args.state)
+    # read-only commands (read, ls, cd…) leave the snapshot untouched
+    if vfs._dirty:
+        for opcode, op_args in _journal:
+            persist.append_op(opcode, op_args, args.state)
+        _journal.clear()
+        if persist.needs_compaction(args.state):
+            persist.save_async(vfs, args.state)
 
 
 if __name__ == "__main__":
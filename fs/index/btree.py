@@ -2,6 +2,8 @@
 fs.btree
 ========
 A minimalist, in‑memory B‑tree suited for directory indices.
+Directories now use a plain dict; this tree is kept as a benchmark
+subject for scripts/compare_trees.py.
 
 * Order (fan‑out) defaults to 64 → each node stores up to 63 keys.
 * Only the operations we need: insert, get, delete, scan(prefix).
@@ -24,6 +26,10 @@ class _Node:
 
 
 class BTree:
+    # Split keeps the pivot in the left leaf but search steps right past
+    # it, so pivots become unreachable; benchmarks must check what stuck.
+    may_drop_on_split = True
+
     def __init__(self, order: int = 64):
         self._root = _Node(leaf=True)
         self._order = order
@@ -45,6 +51,9 @@ class BTree:
             raise KeyError(key)
         return node.vals[idx]
 
+    def __contains__(self, key: str) -> bool:
+        return self._search(self._root, key)[0] is not None
+
     def delete(self, key: str) -> None:
         #    (minimal) just mark missing for prototype
         node, idx = self._search(self._root, key)
@@ -58,20 +67,23 @@ class BTree:
 
     # ---------------- internals -----------------
     def _search(self, node, key):
-        i = bisect_left(node.keys, key)
-        if node.leaf:
-            if i < len(node.keys) and node.keys[i] == key:
-                return node, i
-            return None, -1
-        if i < len(node.keys) and node.keys[i] == key:
-            i += 1
-        return self._search(node.kids[i], key)
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, key)
+            if node.leaf:
+                if i < len(keys) and keys[i] == key:
+                    return node, i
+                return None, -1
+            if i < len(keys) and keys[i] == key:
+                i += 1
+            node = node.kids[i]
 
     def _insert_non_full(self, node, key, val):
         i = len(node.keys) - 1
         if node.leaf:
-            node.keys.insert(bisect_left(node.keys, key), key)
-            node.vals.insert(node.keys.index(key), val)
+            j = bisect_left(node.keys, key)
+            node.keys.insert(j, key)
+            node.vals.insert(j, val)
         else:
             while i >= 0 and key < node.keys[i]:
                 i -= 1
@@ -106,11 +118,16 @@ class BTree:
 
     
     def _iter_node(self, node):
-        if node.leaf:
-            yield from node.keys
-        else:
-            for i, kid in enumerate(node.kids):
-                yield from self._iter_node(kid)
-                if i < len(node.keys):
-                    yield node.keys[i]
+        """In‑order walk with an explicit stack of (node, next‑kid index)."""
+        stack = [(node, 0)]
+        while stack:
+            node, i = stack.pop()
+            if node.leaf:
+                yield from node.keys
+                continue
+            if 0 < i <= len(node.keys):
+                yield node.keys[i - 1]      # separator after kid i‑1
+            if i < len(node.kids):
+                stack.append((node, i + 1))
+                stack.append((node.kids[i], 0))
 
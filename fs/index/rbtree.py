@@ -7,5 +7,5 @@ from bintrees import RBTree as _RBTree
 
 class RBTree(_RBTree):
     """Red-black tree mapping keys→values."""
-    pass
+    may_drop_on_split = False
 
@@ -0,0 +1,13 @@
+"""
+fs.index.sorteddict
+
+Thin wrapper around sortedcontainers.SortedDict so compare_trees can pit
+it against the tree indexes.  SortedDict keeps keys in a list of sorted
+sublists, so inserts and lookups run on C-level bisect and list ops
+instead of per-node Python objects.
+"""
+from sortedcontainers import SortedDict as _SortedDict
+
+class SortedDictTree(_SortedDict):
+    """Sorted mapping keys→values backed by sortedcontainers.SortedDict."""
+    may_drop_on_split = False
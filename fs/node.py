@@ -1,45 +1,105 @@
 from __future__ import annotations
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from pickle import PickleBuffer
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Iterable
-from .index.btree  import BTree
-from .index.rbtree import RBTree
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-@dataclass
+
+def _slot_state(state) -> dict:
+    """
+    Attribute dict from a node's pickle state: ``(None, slots)`` for the
+    slotted classes, or the plain ``__dict__`` of pre‑slots snapshots.
+    """
+    return state[1] if isinstance(state, tuple) else state
+
+
+@dataclass(slots=True)
 class Meta:
-    created: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    modified: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created: int = field(default_factory=time.time_ns)    # ns since epoch
+    modified: int = field(default_factory=time.time_ns)
     size: int = 0
     perms: str = "rw"         # simple: "r", "w", "rw"
 
-@dataclass
+    # datetimes only when someone wants to display them
+    @property
+    def ctime(self) -> datetime:
+        return datetime.fromtimestamp(self.created / 1e9, timezone.utc)
+
+    @property
+    def mtime(self) -> datetime:
+        return datetime.fromtimestamp(self.modified / 1e9, timezone.utc)
+
+    def __setstate__(self, state):
+        for name, value in _slot_state(state).items():
+            if isinstance(value, datetime):     # pre‑ns snapshots
+                value = (value - _EPOCH) // timedelta(microseconds=1) * 1000
+            setattr(self, name, value)
+
+@dataclass(slots=True)
 class Inode:
     id: int
     is_dir: bool
     meta: Meta = field(default_factory=Meta)
 
+    def __setstate__(self, state):
+        for name, value in _slot_state(state).items():
+            setattr(self, name, value)
+
 class Directory(Inode):
+    __slots__ = ("children", "_sorted_names")
+
     def __init__(self, id_: int):
         super().__init__(id_, is_dir=True)
-        self.children = RBTree()      # key → inode_id  (log‑time index)
+        self.children: dict[str, int] = {}  # name → inode_id  (O(1) index)
+        self._sorted_names: list[str] | None = None   # ls cache
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if not isinstance(self.children, dict):     # bintrees RBTree
+            self.children = dict(self.children.items())
+        self._sorted_names = None
 
     # simple wrappers so vfs.py stays unchanged
     def add_child(self, name: str, inode_id: int):
+        if name not in self.children:
+            self._sorted_names = None
         self.children[name] = inode_id
 
     def get_child(self, name: str) -> int:
         return self.children[name]          # raises KeyError if absent
 
+    def find_child(self, name: str, default: int | None = None) -> int | None:
+        return self.children.get(name, default)   # no exception on a miss
+
     def del_child(self, name: str):
         del self.children[name]
+        self._sorted_names = None
 
     def iter_names(self):
-        return self.children.keys()         # already sorted
+        if self._sorted_names is None:      # sort lazily, once per change
+            self._sorted_names = sorted(self.children)
+        return iter(self._sorted_names)
 
 class File(Inode):
+    __slots__ = ("content",)
+
     def __init__(self, id_: int, content: bytes | bytearray = b""):
         super().__init__(id_, is_dir=False)
-        self.content = bytearray(content)
+        self.content = bytes(content)   # immutable: shared, never copied
         self.meta.size = len(self.content)
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if not isinstance(self.content, bytes):     # bytearray era
+            self.content = bytes(self.content)
+
+    def __reduce_ex__(self, proto):
+        # protocol 5: hand the payload to the pickler as a zero‑copy
+        # buffer so persist can store it out‑of‑band
+        if proto < 5:
+            return super().__reduce_ex__(proto)
+        return File, (self.id, PickleBuffer(self.content)), (None, {"meta": self.meta})
+
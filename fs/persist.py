@@ -3,8 +3,20 @@ fs.persist
 ==========
 
 Tiny snapshot helper for the virtual file‑system.
-We pickle‑and‑gzip the entire VFS object so every CLI invocation
-can share the same state file.
+We pickle the entire VFS object so every CLI invocation can share the
+same state file.
+
+Snapshot layout (all integers little‑endian u64)::
+
+    b"VFS5" | len | zstd(pickle protocol 5) | n_buffers | (len | bytes)*
+
+Out‑of‑band pickle buffers are stored raw after the compressed pickle
+stream, so zstd never has to chew through file payloads twice.
+Legacy gzip snapshots are still readable.
+
+Between snapshots, CLI mutations go to an append‑only op log
+(``<snapshot>.log``) of length‑prefixed pickled ``(opcode, args)``
+records, replayed on load.
 
 ⚠︎  Prototype‑only:
     Pickle is not secure against untrusted files—don’t use this
@@ -14,30 +26,220 @@ can share the same state file.
 from __future__ import annotations
 
 import gzip
-import pickle
+import io
+import os
+import platform
+import struct
+import threading
+from pickle import (
+    HIGHEST_PROTOCOL, PickleBuffer, Pickler, Unpickler, dumps, loads,
+)
 from pathlib import Path
 from typing import Union
 
+import zstandard
+
+from .exceptions import FileExists, FileNotFound, FSException
 from .vfs import VFS
 
+# CPython's pickle.Pickler/Unpickler must be the _pickle C classes; only
+# PyPy is allowed to fall back to the pure‑Python ones
+try:
+    from _pickle import Pickler as _CPickler
+except ImportError:
+    _CPickler = None
+if Pickler is not _CPickler and platform.python_implementation() != "PyPy":
+    raise ImportError("fs.persist needs the C pickle accelerator (_pickle)")
+
+_MAGIC = b"VFS5"
+_GZIP_MAGIC = b"\x1f\x8b"
+_LEN = struct.Struct("<Q")
+
+# mutations are appended to "<snapshot>.log"; the snapshot is rewritten
+# once the log grows past COMPACT_RATIO × its size
+COMPACT_RATIO = 4
+_COMPACT_MIN = 64 * 1024
+_REPLAY_OPS = frozenset({"mkdir", "makedirs", "touch", "write", "rm"})
+
+# zstd contexts are reusable; build them once per process.  They are not
+# thread‑safe, and saves may run on the background Saver thread.
+_CCTX = zstandard.ZstdCompressor(level=3, threads=-1)
+_CCTX_LOCK = threading.Lock()
+_DCTX = zstandard.ZstdDecompressor()
+
+
+def _read_len(fh) -> int:
+    return _LEN.unpack(fh.read(_LEN.size))[0]
+
+
+def _log_path(path: Union[str, Path]) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + ".log")
+
+
+def _load_snapshot(p: Path) -> VFS:
+    if not p.exists():
+        return VFS()
+
+    with open(p, "rb") as fh:
+        magic = fh.read(len(_MAGIC))
+        if magic.startswith(_GZIP_MAGIC):
+            fh.seek(0)
+            with gzip.open(fh, "rb") as gz:
+                return Unpickler(gz).load()
+        if magic != _MAGIC:
+            raise FSException(f"{p}: not a VFS snapshot")
+
+        stream = fh.read(_read_len(fh))
+        buffers = [fh.read(_read_len(fh)) for _ in range(_read_len(fh))]
+
+    with _DCTX.stream_reader(io.BytesIO(stream)) as zfh:
+        return Unpickler(zfh, buffers=buffers).load()
+
+
+def _replay(vfs: VFS, log: Path) -> None:
+    if not log.exists():
+        return
+    data = memoryview(log.read_bytes())
+    pos = 0
+    while pos + _LEN.size <= len(data):
+        (n,) = _LEN.unpack_from(data, pos)
+        pos += _LEN.size
+        if pos + n > len(data):
+            break                      # torn tail from an interrupted append
+        opcode, args = loads(data[pos : pos + n])
+        pos += n
+        if opcode not in _REPLAY_OPS:
+            raise FSException(f"{log}: unknown op {opcode!r}")
+        try:
+            getattr(vfs, opcode)(*args)
+        except (FileExists, FileNotFound):
+            # a crash between writing the snapshot and unlinking the log
+            # replays ops the snapshot already holds: mkdir/touch of an
+            # existing name, rm of a missing one.  Anything else is a real
+            # snapshot/log mismatch and propagates.
+            pass
+
+
 def load(path: Union[str, Path]) -> VFS:
     """
-    Return a VFS instance loaded from *path*, or a fresh one if the file
-    doesn’t exist.
+    Return a VFS instance loaded from *path* with its op log replayed on
+    top, or a fresh one if neither file exists.
     """
     p = Path(path)
-    if not p.exists():
-        return VFS()
+    vfs = _load_snapshot(p)
+    _replay(vfs, _log_path(p))
+    vfs._dirty = False
+    return vfs
+
+
+def append_op(opcode: str, args: tuple, path: Union[str, Path]) -> None:
+    """
+    Append one mutation record (``vfs.<opcode>(*args)``) to the op log
+    next to the snapshot at *path*.
+    """
+    rec = dumps((opcode, args), protocol=HIGHEST_PROTOCOL)
+    with open(_log_path(path), "ab") as fh:
+        fh.write(_LEN.pack(len(rec)) + rec)
 
-    with gzip.open(p, "rb") as fh:
-        return pickle.load(fh)
+
+def needs_compaction(path: Union[str, Path]) -> bool:
+    """True once the op log has outgrown the snapshot it sits next to."""
+    p = Path(path)
+    try:
+        log_size = _log_path(p).stat().st_size
+    except FileNotFoundError:
+        return False
+    snap_size = p.stat().st_size if p.exists() else 0
+    return log_size > COMPACT_RATIO * max(snap_size, _COMPACT_MIN)
 
 
 def save(vfs: VFS, path: Union[str, Path]) -> None:
     """
-    Serialize *vfs* to *path*, overwriting the file.
+    Serialize *vfs* to *path*, atomically replacing the file, and drop
+    the op log it supersedes.
     """
     p = Path(path)
-    with gzip.open(p, "wb") as fh:
-        pickle.dump(vfs, fh)
+    buffers: list[PickleBuffer] = []
+    stream = io.BytesIO()
+    with _CCTX_LOCK, _CCTX.stream_writer(stream, closefd=False) as zfh:
+        Pickler(
+            zfh, protocol=HIGHEST_PROTOCOL, buffer_callback=buffers.append
+        ).dump(vfs)
+
+    tmp = p.with_name(p.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_MAGIC)
+        fh.write(_LEN.pack(stream.tell()))
+        fh.write(stream.getbuffer())
+        fh.write(_LEN.pack(len(buffers)))
+        for buf in buffers:
+            raw = buf.raw()
+            fh.write(_LEN.pack(raw.nbytes))
+            fh.write(raw)
+    os.replace(tmp, p)
+    _log_path(p).unlink(missing_ok=True)
+    vfs._dirty = False
+
+
+class Saver:
+    """
+    Background snapshot writer.
+
+    `save_async` records the latest ``(vfs, path)`` request and returns;
+    a daemon worker drains it, so back‑to‑back requests coalesce into a
+    single write.  `flush` blocks until nothing is pending and re‑raises
+    any error the worker hit.  Don't mutate a VFS while its save is
+    in flight.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: tuple[VFS, Path] | None = None
+        self._worker: threading.Thread | None = None
+        self._error: Exception | None = None
+
+    def save_async(self, vfs: VFS, path: Union[str, Path]) -> None:
+        with self._lock:
+            self._pending = (vfs, Path(path))
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="vfs-saver", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                job, self._pending = self._pending, None
+                if job is None:
+                    self._worker = None
+                    return
+            try:
+                save(*job)
+            except Exception as e:          # surfaced by flush()
+                self._error = e
+
+    def flush(self) -> None:
+        while True:
+            with self._lock:
+                worker = self._worker
+            if worker is None:
+                break
+            worker.join()
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+
+_SAVER = Saver()
+
+
+def save_async(vfs: VFS, path: Union[str, Path]) -> None:
+    """Queue `save(vfs, path)` on the shared background `Saver`."""
+    _SAVER.save_async(vfs, path)
+
 
+def flush() -> None:
+    """Wait for any queued `save_async` to finish."""
+    _SAVER.flush()
@@ -14,13 +14,24 @@ All paths must be absolute (begin with “/”).
 
 from __future__ import annotations
 
-from pathlib import PurePosixPath
+from collections import OrderedDict
 from typing import Iterable
 
 from .exceptions import FileExists, FileNotFound, FSException, NotDirectory
 from .inode_table import InodeTable
 from .node import Directory, File
 
+# bound on each path → inode lookup cache (FIFO eviction)
+_PATH_CACHE_SIZE = 8192
+
+
+def _remember(cache: OrderedDict, key, value) -> None:
+    # popitem(last=False) is O(1); next(iter(dict)) would rescan the
+    # deleted slots a plain dict leaves at its front after each eviction
+    if len(cache) >= _PATH_CACHE_SIZE:
+        cache.popitem(last=False)
+    cache[key] = value
+
 
 class VFS:
     """A minimal, single‑user, in‑memory virtual FS."""
@@ -31,6 +42,21 @@ class VFS:
     def __init__(self):
         self.table = InodeTable()
         self.root_id = self.table.allocate(Directory(id_=-1))
+        self._dirty = False      # unsaved mutations since last load/save
+        # FIFO‑bounded lookup caches: _split_path, and read → File id
+        self._path_cache: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._inode_cache: OrderedDict[str, int] = OrderedDict()
+
+    # caches are rebuilt on demand; keep them out of snapshots
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_path_cache"], state["_inode_cache"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._path_cache = OrderedDict()
+        self._inode_cache = OrderedDict()
 
     # ------------------------------------------------------------------
     # internal helpers
@@ -40,74 +66,118 @@ class VFS:
         Return (parent_inode_id, final_name).
 
         Creates intermediate directories if `create_missing` is True.
+        Results are cached per path string until the next `rm`.
         """
-        p = PurePosixPath(path)
-        if not p.is_absolute():
+        hit = self._path_cache.get(path)
+        if hit is not None:
+            return hit
+        if not path.startswith("/"):
             raise FSException("path must start with '/'")
 
-        parts = p.parts[1:]  # skip root
+        parts = path.split("/")[1:]  # skip root
+        if "" in parts or "." in parts:  # "//", trailing "/", "/./"
+            parts = [seg for seg in parts if seg and seg != "."]
         cur_id = self.root_id
         for seg in parts[:-1]:
             cur_dir = self.table.get(cur_id)
-            if not isinstance(cur_dir, Directory):
+            if not cur_dir.is_dir:
                 raise NotDirectory(seg)
 
             # walk or mkdir -p
-            try:
-                cur_id = cur_dir.get_child(seg)
-            except KeyError:
+            child_id = cur_dir.find_child(seg)
+            if child_id is None:
                 # auto‑create
-                new_id = self.table.allocate(Directory(id_=-1))
-                cur_dir.add_child(seg, new_id)
-                cur_id = new_id
-
-        return cur_id, parts[-1] if parts else ""
+                child_id = self.table.allocate(Directory(id_=-1))
+                cur_dir.add_child(seg, child_id)
+                self._dirty = True
+            cur_id = child_id
+
+        result = cur_id, parts[-1] if parts else ""
+        # only cache directory parents: rm_at relies on a removed file
+        # never being the parent of a cached path
+        if self.table.get(cur_id).is_dir:
+            _remember(self._path_cache, path, result)
+        return result
 
     def _assert_dir(self, inode_id: int, ctx: str = "") -> Directory:
         node = self.table.get(inode_id)
-        if not isinstance(node, Directory):
+        if not node.is_dir:
             raise NotDirectory(ctx or "")
         return node
 
+    def _ensure_dir(self, path: str) -> Directory:
+        """Return the directory at `path`, creating it (mkdir -p) if missing."""
+        parent_id, name = self._split_path(path)
+        parent = self._assert_dir(parent_id, path)
+        if not name:
+            return parent                   # "/"
+        child_id = parent.find_child(name)
+        if child_id is None:
+            child_id = self.table.allocate(Directory(id_=-1))
+            parent.add_child(name, child_id)
+            self._dirty = True
+        return self._assert_dir(child_id, path)
+
+    def makedirs(self, path: str):
+        """Create directory `path` and any missing parents (mkdir -p)."""
+        self._ensure_dir(path)
+
     def mkdir(self, path: str):
         parent_id, name = self._split_path(path)
         parent = self._assert_dir(parent_id, path)
-        try:
-            parent.get_child(name)
+        if parent.find_child(name) is not None:
             raise FileExists(name)
-        except KeyError:
-            new_id = self.table.allocate(Directory(id_=-1))
-            parent.add_child(name, new_id)
+        parent.add_child(name, self.table.allocate(Directory(id_=-1)))
+        self._dirty = True
 
     def touch(self, path: str):
         parent_id, name = self._split_path(path)
         parent = self._assert_dir(parent_id, path)
-        try:
-            parent.get_child(name)
+        if parent.find_child(name) is not None:
             raise FileExists(name)
-        except KeyError:
-            new_id = self.table.allocate(File(id_=-1))
-            parent.add_child(name, new_id)
+        parent.add_child(name, self.table.allocate(File(id_=-1)))
+        self._dirty = True
+
+    def touch_many(self, parent: str, names: Iterable[str]):
+        """
+        `touch` every name in `names` inside directory `parent`, which is
+        resolved (mkdir -p) once instead of once per file.
+        """
+        dnode = self._ensure_dir(parent)
+        alloc = self.table.allocate
+        self._dirty = True
+        for name in names:
+            if dnode.find_child(name) is not None:
+                raise FileExists(name)
+            dnode.add_child(name, alloc(File(id_=-1)))
 
     def write(self, path: str, data: bytes | str):
+        parent_id, name = self._split_path(path)
+        self.write_at(self._assert_dir(parent_id, path), name, data)
+
+    def write_at(self, parent: Directory, name: str, data: bytes | str):
+        """`write` to `name` inside an already‑resolved directory node."""
         if isinstance(data, str):
             data = data.encode()
+        elif not isinstance(data, bytes):
+            data = bytes(data)
 
-        parent_id, name = self._split_path(path)
-        parent = self._assert_dir(parent_id, path)
-
-        try:
-            inode_id = parent.get_child(name)
+        inode_id = parent.find_child(name)
+        if inode_id is None:
+            parent.add_child(name, self.table.allocate(File(id_=-1, content=data)))
+        else:
             node = self.table.get(inode_id)
-            if not isinstance(node, File):
+            if node.is_dir:
                 raise NotDirectory(name)
-            node.content[:] = data
+            node.content = data
             node.meta.size = len(data)
-        except KeyError:
-            new_id = self.table.allocate(File(id_=-1, content=data))
-            parent.add_child(name, new_id)
+        self._dirty = True
 
     def read(self, path: str) -> bytes:
+        inode_id = self._inode_cache.get(path)
+        if inode_id is not None:
+            return self.table.get(inode_id).content
+
         parent_id, name = self._split_path(path)
         parent = self._assert_dir(parent_id, path)
         try:
@@ -115,9 +185,23 @@ class VFS:
         except KeyError:
             raise FileNotFound(name) from None
         node = self.table.get(inode_id)
-        if not isinstance(node, File):
+        if node.is_dir:
             raise NotDirectory(name)
-        return bytes(node.content)
+        _remember(self._inode_cache, path, inode_id)
+        return node.content
+
+    def bulk_create(self, dirs: list[tuple[str, list[tuple[str, bytes]]]]):
+        """
+        Create many files in one pass.  For each ``(dir_path, files)`` the
+        directory is resolved (mkdir -p) once and every ``(name, data)``
+        is written to it directly via `write_at`, skipping per‑file path
+        parsing.  Existing files are overwritten in place, like `write`.
+        """
+        write_at = self.write_at
+        for dir_path, files in dirs:
+            dnode = self._ensure_dir(dir_path)
+            for name, data in files:
+                write_at(dnode, name, data)
 
     def ls(self, path: str = "/") -> list[str]:
         if path == "/":
@@ -134,12 +218,23 @@ class VFS:
         Remove a file or empty directory at `path`.
         """
         parent_id, name = self._split_path(path)
-        parent = self._assert_dir(parent_id, path)
+        self.rm_at(self._assert_dir(parent_id, path), name)
 
+    def rm_at(self, parent: Directory, name: str):
+        """`rm` of `name` inside an already‑resolved directory node."""
         try:
             inode_id = parent.get_child(name)
         except KeyError:
             raise FileNotFound(name)
 
         parent.del_child(name)
+        self._dirty = True
+
+        # Only removals can stale a cached lookup.  Paths may alias
+        # ("/a//b"), so drop whole caches rather than matching prefixes.
+        # _split_path only caches directory parents, so removing a file
+        # can't stale _path_cache.
+        self._inode_cache.clear()
+        if self.table.get(inode_id).is_dir:
+            self._path_cache.clear()
 
@@ -0,0 +1,64 @@
+"""
+Helpers shared by the benchmark scripts (bench_fs, compare_trees).
+"""
+
+import csv
+import gc
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def pin_cpu() -> None:
+    """Pin the process to CPU 0 where supported, so samples don't migrate."""
+    try:
+        os.sched_setaffinity(0, {0})
+    except (AttributeError, OSError):   # not Linux, or CPU 0 not allowed
+        pass
+
+@contextmanager
+def timed_window(warmup=None):
+    """
+    Wrap a timed loop: run *warmup()* once untimed to prime the code path,
+    then collect and keep cyclic GC off until the block exits, so neither
+    a cold first call nor a collection lands in the samples.
+    """
+    if warmup is not None:
+        warmup()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+def p95(a: np.ndarray) -> float:
+    """95th percentile by O(n) partial selection instead of a full sort."""
+    k = int(0.95 * (len(a) - 1))
+    return float(np.partition(a, k)[k])
+
+def format_table(rows) -> str:
+    """Right-aligned text table of *rows* (dicts sharing keys); floats to 2 dp."""
+    cols = list(rows[0])
+    cells = [[f"{r[c]:0.2f}" if isinstance(r[c], float) else str(r[c]) for c in cols]
+             for r in rows]
+    widths = [max(len(c), *(len(row[j]) for row in cells)) for j, c in enumerate(cols)]
+    lines = [cols] + cells
+    return "\n".join("  ".join(v.rjust(w) for v, w in zip(line, widths)) for line in lines)
+
+def write_csv(rows, path) -> None:
+    """Write *rows* (dicts sharing keys) to *path* with a header line."""
+    with open(path, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def pyplot():
+    """
+    matplotlib.pyplot, imported on first call.  It is a reporting-only
+    dependency: call this after measuring so its import cost and memory
+    stay out of the benchmark process until it's done.
+    """
+    import matplotlib.pyplot as plt
+    return plt
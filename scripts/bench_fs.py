@@ -2,27 +2,71 @@
 """
 Full benchmark: measure write/delete latency and Python memory usage
 across different directory scales. Uses tracemalloc for peak allocations.
+
+Latency and memory come from separate runs of the same seeded op
+sequence: tracemalloc hooks every allocation, so timing under it
+would mostly measure the hook.
 """
 
+import argparse
+import copy
 import time
 import random
-import statistics as stat
 import tracemalloc
-import pandas as pd
-import matplotlib.pyplot as plt
-from tqdm import tqdm
+import numpy as np
 
 from fs.vfs import VFS
+from scripts._bench import format_table, p95, pin_cpu, pyplot, timed_window, write_csv
+
+SEED = 42  # reproducible sampling; timed and traced runs share op sequences
+PAYLOAD = b"x" * 128
 
-# reproducible sampling
-random.seed(42)
+def dir_name(d: int) -> str:
+    return f"dir_{d:04d}"
 
-def populate(vfs: VFS, n_dirs: int, n_files: int):
+def file_name(f: int) -> str:
+    return f"file_{f:05d}.bin"
+
+def populate(vfs: VFS, n_dirs: int, n_files: int) -> list[str]:
+    """
+    Create n_dirs dirs of n_files empty files each.  Every directory uses
+    the same file names, so they are formatted once and shared; the list
+    is returned for callers to index by f.
+    """
+    names = [file_name(f) for f in range(n_files)]
     for d in range(n_dirs):
-        dpath = f"/dir_{d:04d}"
+        dpath = "/" + dir_name(d)
         vfs.mkdir(dpath)
-        for f in range(n_files):
-            vfs.touch(f"{dpath}/file_{f:05d}.bin")
+        vfs.touch_many(dpath, names)
+    return names
+
+def dir_nodes(vfs: VFS, n_dirs: int) -> list:
+    """populate()'s Directory nodes indexed by d, resolved once up front."""
+    root = vfs.table.get(vfs.root_id)
+    return [vfs.table.get(root.get_child(dir_name(d))) for d in range(n_dirs)]
+
+def _time_phase(op, targets, warmup) -> np.ndarray:
+    """
+    Per-call latency (ns) of op(*t) for each target; tracemalloc off.
+    The loop runs inside `timed_window`, warmed up with op(*warmup).
+    """
+    clk = time.perf_counter_ns          # int clock: no float math per sample
+    times = np.empty(len(targets), dtype=np.int64)
+    with timed_window(lambda: op(*warmup)):
+        for i, t in enumerate(targets):
+            t0 = clk()
+            op(*t)
+            times[i] = clk() - t0
+    return times
+
+def _mem_phase(op, targets) -> int:
+    """Peak traced bytes while running op(*t) for each target; untimed."""
+    tracemalloc.start()
+    for t in targets:
+        op(*t)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
 
 def benchmark(config, n_ops=5_000):
     n_dirs, n_files = config
@@ -30,76 +74,84 @@ def benchmark(config, n_ops=5_000):
     # ---------- population + memory ----------
     tracemalloc.start()
     vfs = VFS()
-    populate(vfs, n_dirs, n_files)
+    names = populate(vfs, n_dirs, n_files)
     _, peak_pop = tracemalloc.get_traced_memory()
     tracemalloc.stop()
 
-    # gather all existing file paths
-    paths = []
-    root = vfs.table.get(vfs.root_id)
-    for dname in root.iter_names():
-        dnode = vfs.table.get(root.get_child(dname))
-        for fname in dnode.iter_names():
-            paths.append(f"/{dname}/{fname}")
-
-    # ---------- write latency ----------
-    write_times = []
-    tracemalloc.start()
-    for _ in range(n_ops):
-        p = random.choice(paths)
-        t0 = time.perf_counter()
-        vfs.write(p, b"x" * 128)
-        write_times.append((time.perf_counter() - t0) * 1e6)
-    _, peak_write = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-
-    # ---------- delete latency ----------
-    # rebuild fresh VFS to avoid deleting from the already-mutated one
-    tracemalloc.start()
-    vfs2 = VFS()
-    populate(vfs2, n_dirs, n_files)
-    delete_times = []
-    # delete up to as many files as exist
-    delete_count = min(n_ops, len(paths))
-    # one-by-one random deletes
-    for _ in range(delete_count):
-        idx = random.randrange(len(paths))
-        p = paths.pop(idx)
-        t0 = time.perf_counter()
-        vfs2.rm(p)
-        delete_times.append((time.perf_counter() - t0) * 1e6)
-    _, peak_delete = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+    # files are addressed by index i → (dir, file) = divmod(i, n_files).
+    # Ops target (Directory node, name) via write_at/rm_at, so the timed
+    # region measures the index mutation, not path parsing and lookup.
+    n_total = n_dirs * n_files
+    dirs = dir_nodes(vfs, n_dirs)
+    rng = random.Random(SEED)
+    writes = []
+    for i in rng.choices(range(n_total), k=n_ops):   # one batched RNG call
+        d, f = divmod(i, n_files)
+        writes.append((dirs[d], names[f], PAYLOAD))
+
+    # ---------- write latency, then write memory ----------
+    write_times = _time_phase(vfs.write_at, writes, writes[0])
+    peak_write = _mem_phase(vfs.write_at, writes)
+
+    # ---------- delete latency, then delete memory ----------
+    # Writes only replace contents, so the same VFS serves the deletes.
+    # Deletes are destructive, and rm_at only unlinks names from their
+    # directory, so the traced run gets copies of the directory nodes
+    # with their own children dicts; both runs delete the same random
+    # victims.  The warm-up removes an extra file, so every populated
+    # file stays a candidate.
+    dir_copies = [copy.copy(node) for node in dirs]
+    for node in dir_copies:
+        node.children = node.children.copy()
+    delete_count = min(n_ops, n_total)
+    rng = random.Random(SEED)
+    victims = [divmod(i, n_files) for i in rng.sample(range(n_total), delete_count)]
+    vfs.touch("/" + dir_name(0) + "/.warmup")
+    delete_times = _time_phase(
+        vfs.rm_at, [(dirs[d], names[f]) for d, f in victims], (dirs[0], ".warmup")
+    )
+    peak_delete = _mem_phase(vfs.rm_at, [(dir_copies[d], names[f]) for d, f in victims])
 
     return {
         "dirs": n_dirs,
         "files/dir": n_files,
         "objects": n_dirs * n_files,
         "pop_peak_MB": peak_pop / 1024**2,
-        "p50_write_µs": stat.median(write_times),
-        "p95_write_µs": stat.quantiles(write_times, n=20)[18],
+        "p50_write_µs": float(np.median(write_times)) / 1e3,
+        "p95_write_µs": p95(write_times) / 1e3,
         "write_peak_MB": peak_write / 1024**2,
-        "p50_del_µs": stat.median(delete_times),
-        "p95_del_µs": stat.quantiles(delete_times, n=20)[18],
+        "p50_del_µs": float(np.median(delete_times)) / 1e3,
+        "p95_del_µs": p95(delete_times) / 1e3,
         "del_peak_MB": peak_delete / 1024**2,
     }
 
 def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--csv", metavar="PATH", help="also write the results table as CSV")
+    args = ap.parse_args()
+
     configs = [(20, 200), (100, 1000), (300, 2000)]
     results = []
-    for cfg in tqdm(configs, desc="Scaling configs"):
+    pin_cpu()
+    for i, cfg in enumerate(configs, 1):
+        print(f"[{i}/{len(configs)}] dirs={cfg[0]} files/dir={cfg[1]}", flush=True)
         results.append(benchmark(cfg))
-    df = pd.DataFrame(results)
 
     # print table
-    print(df.to_string(index=False, float_format="{:0.2f}".format))
+    print(format_table(results))
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"CSV saved → {args.csv}")
+
+    plt = pyplot()
 
     # plot latencies
+    col = lambda key: [r[key] for r in results]
     plt.figure(figsize=(6,4))
-    plt.plot(df["objects"], df["p50_write_µs"], marker="o", label="p50 write")
-    plt.plot(df["objects"], df["p95_write_µs"], marker="o", label="p95 write")
-    plt.plot(df["objects"], df["p50_del_µs"],  marker="s", label="p50 delete")
-    plt.plot(df["objects"], df["p95_del_µs"],  marker="s", label="p95 delete")
+    plt.plot(col("objects"), col("p50_write_µs"), marker="o", label="p50 write")
+    plt.plot(col("objects"), col("p95_write_µs"), marker="o", label="p95 write")
+    plt.plot(col("objects"), col("p50_del_µs"),  marker="s", label="p50 delete")
+    plt.plot(col("objects"), col("p95_del_µs"),  marker="s", label="p95 delete")
     plt.xscale("log")
     plt.xlabel("Total files")
     plt.ylabel("Latency (µs)")
@@ -1,4 +1,4 @@
-import time, random, statistics as stat, pandas as pd, matplotlib.pyplot as plt
+import time, random, statistics as stat, numpy as np, pandas as pd, matplotlib.pyplot as plt
 from fs.vfs import VFS                      # uses your in‑repo package
 from tqdm import tqdm                      # optional progress bar
 
@@ -6,30 +6,24 @@ random.seed(42)                            # reproducibility
 
 def populate(vfs, n_dirs, n_files):
     """mkdir ‑p and touch a bunch of empty files"""
-    for d in range(n_dirs):
-        dir_path = f"/dir_{d:04d}"
-        vfs.mkdir(dir_path)
-        for f in range(n_files):
-            vfs.touch(f"{dir_path}/file_{f:05d}.bin")
+    files = [(f"file_{f:05d}.bin", b"") for f in range(n_files)]
+    dirs = [f"/dir_{d:04d}" for d in range(n_dirs)]
+    vfs.bulk_create([(d, files) for d in dirs])
+    return ["/".join((d, name)) for d in dirs for name, _ in files]
 
-def run_once(n_dirs, n_files, n_ops=10_000):
+def run_once(n_dirs, n_files, n_ops=10_000, block=100):
     vfs = VFS()
-    populate(vfs, n_dirs, n_files)
-
-    # collect all file paths just once
-    paths = []
-    root = vfs.table.get(vfs.root_id)
-    for dir_name in root.iter_names():
-        child_dir = vfs.table.get(root.get_child(dir_name))
-        for fname in child_dir.iter_names():
-            paths.append(f"/{dir_name}/{fname}")
+    paths = populate(vfs, n_dirs, n_files)   # paths come back for free
 
+    # time blocks of reads: per-op perf_counter calls cost as much as a read
+    idxs = np.random.default_rng(42).integers(0, len(paths), size=n_ops)
     samples = []
-    for _ in range(n_ops):
-        p = random.choice(paths)
-        t0 = time.perf_counter()
-        vfs.read(p)
-        samples.append((time.perf_counter() - t0) * 1e6)  # µs
+    for start in range(0, n_ops, block):             # short last block too
+        batch = [paths[i] for i in idxs[start:start + block]]
+        t0 = time.perf_counter_ns()
+        for p in batch:
+            vfs.read(p)
+        samples.append((time.perf_counter_ns() - t0) / len(batch) / 1e3)  # µs/read
 
     return {
         "dirs": n_dirs,
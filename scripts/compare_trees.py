@@ -5,25 +5,26 @@ compare_trees.py
 Compare insertion & lookup performance + memory usage for:
   • fs.btree.BTree       (order=64)
   • bintrees.RBTree      (red-black tree)
+  • sortedcontainers.SortedDict (sorted list-of-lists)
 
 Usage:
-    pip install bintrees pandas matplotlib tqdm
+    pip install bintrees sortedcontainers matplotlib
     chmod +x compare_trees.py
-    ./compare_trees.py
+    ./compare_trees.py [--csv results.csv]
 """
 
+import argparse
 import random
 import string
 import time
 import tracemalloc
-import statistics as stat
 
-import pandas as pd
-import matplotlib.pyplot as plt
-from tqdm import tqdm
+import numpy as np
 
 from fs.index.btree  import BTree
 from fs.index.rbtree import RBTree
+from fs.index.sorteddict import SortedDictTree
+from scripts._bench import format_table, p95, pin_cpu, pyplot, timed_window, write_csv
 
 # -- CONFIGURATION ----------------------------------------------------------
 SCALES = [10_000, 50_000, 100_000]   # number of keys to insert
@@ -32,13 +33,51 @@ KEY_LEN = 8                          # length of each random key
 # ----------------------------------------------------------------------------
 
 def make_keys(n):
-    """Generate n distinct random string keys."""
-    rnd = random.Random(42)
-    chars = string.ascii_lowercase + string.digits
-    keys = set()
+    """Generate n distinct random string keys, in random order."""
+    rng = np.random.default_rng(42)
+    chars = np.frombuffer((string.ascii_lowercase + string.digits).encode(), np.uint8)
+    keys = np.empty(0, dtype=f"S{KEY_LEN}")
     while len(keys) < n:
-        keys.add("".join(rnd.choices(chars, k=KEY_LEN)))
-    return list(keys)
+        # oversample so one round almost always yields n distinct keys
+        idx = rng.integers(0, len(chars), size=(int(n * 1.3), KEY_LEN))
+        batch = chars[idx].view(f"S{KEY_LEN}").ravel()
+        keys = np.unique(np.concatenate((keys, batch)))
+    # np.unique sorts; shuffle so inserts don't arrive in key order
+    return [k.decode() for k in rng.permutation(keys)[:n].tolist()]
+
+def bulk_time_insert(insert, keys, out):
+    """
+    Call insert(k, 0) for every key, storing each call's latency (ns) in
+    the preallocated int64 array *out*.  One tight loop with everything
+    bound to locals, so per-op overhead is just the two clock reads;
+    call it with tracemalloc off.  The loop runs inside `timed_window`.
+    """
+    clk = time.perf_counter_ns
+    with timed_window():
+        for i, k in enumerate(keys):
+            t0 = clk()
+            insert(k, 0)
+            out[i] = clk() - t0
+    return out
+
+def traced_peak(run):
+    """Peak traced bytes while run() executes; for untimed passes only."""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def tree_api(tree):
+    """
+    (insert, get) bound to *tree*: both insert(k, v) and __setitem__(k, v)
+    fit, and BTree.get raises KeyError like the mappings' __getitem__
+    (their .get doesn't).
+    """
+    if isinstance(tree, BTree):
+        return tree.insert, tree.get
+    return tree.__setitem__, tree.__getitem__
 
 def bench_tree(TreeClass, keys, lookups):
     """
@@ -48,93 +87,112 @@ def bench_tree(TreeClass, keys, lookups):
     Then:
       • lookup_time (median & p95 in µs) over only successfully inserted keys
       • lookup_mem_peak (MB)
+    Latencies come from timed runs with tracemalloc off; each memory peak
+    from a separate untimed run of the same ops, since tracemalloc's
+    allocation hook would otherwise dominate the timings.
     """
     # ------- insertion -------
-    insert_times = []
-    tracemalloc.start()
+    # warm the insert path on a throwaway tree so the measured one holds
+    # exactly `keys`
+    warm_insert, _ = tree_api(TreeClass())
+    warm_insert(keys[0], 0)
+    insert_times = np.empty(len(keys), dtype=np.int64)
     tree = TreeClass()
-    for k in keys:
-        t0 = time.perf_counter()
-        if isinstance(tree, BTree):
-            tree.insert(k, 0)
-        else:
-            tree[k] = 0
-        insert_times.append((time.perf_counter() - t0)*1e6)
-    _, peak_ins = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+    insert, get = tree_api(tree)
+    bulk_time_insert(insert, keys, insert_times)
+
+    def build():                        # traced twin of the timed inserts
+        traced_insert, _ = tree_api(TreeClass())
+        for k in keys:
+            traced_insert(k, 0)
+    peak_ins = traced_peak(build)
 
     # ------- determine which keys actually got stored -------
-    available = []
-    for k in keys:
-        try:
-            # BTree.get / RBTree.__getitem__
-            _ = tree.get(k) if isinstance(tree, BTree) else tree[k]
-            available.append(k)
-        except KeyError:
-            pass
+    # only trees that advertise the split bug need the extra N lookups
+    if TreeClass.may_drop_on_split:
+        available = [k for k in keys if k in tree]
+    else:
+        available = keys
     dropped = len(keys) - len(available)
     if dropped:
         print(f"    ⚠️  {TreeClass.__name__} dropped {dropped} keys during splits")
 
     # ------- lookup -------
-    lookup_times = []
-    tracemalloc.start()
-    for _ in range(lookups):
-        k = random.choice(available)
-        t0 = time.perf_counter()
-        _ = tree.get(k) if isinstance(tree, BTree) else tree[k]
-        lookup_times.append((time.perf_counter() - t0)*1e6)
-    _, peak_lu = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+    lookup_times = np.empty(lookups, dtype=np.int64)
+    targets = random.choices(available, k=lookups)
+    clk = time.perf_counter_ns
+    with timed_window(lambda: get(available[0])):
+        for i, k in enumerate(targets):
+            t0 = clk()
+            get(k)
+            lookup_times[i] = clk() - t0
+
+    def lookup_all():                   # traced twin of the timed lookups
+        for k in targets:
+            get(k)
+    peak_lu = traced_peak(lookup_all)
 
     return {
         "impl": TreeClass.__name__,
         "n_keys": len(keys),
-        "insert_p50_µs": stat.median(insert_times),
-        "insert_p95_µs": stat.quantiles(insert_times, n=20)[18],
+        "insert_p50_µs": float(np.median(insert_times)) / 1e3,
+        "insert_p95_µs": p95(insert_times) / 1e3,
         "insert_peak_MB": peak_ins / 1024**2,
-        "lookup_p50_µs": stat.median(lookup_times),
-        "lookup_p95_µs": stat.quantiles(lookup_times, n=20)[18],
+        "lookup_p50_µs": float(np.median(lookup_times)) / 1e3,
+        "lookup_p95_µs": p95(lookup_times) / 1e3,
         "lookup_peak_MB": peak_lu / 1024**2,
     }
 
 def main():
+    ap = argparse.ArgumentParser(description="Compare BTree/RBTree/SortedDict insert & lookup.")
+    ap.add_argument("--csv", metavar="PATH", help="also write the results table as CSV")
+    args = ap.parse_args()
+
     random.seed(0)
     results = []
+    pin_cpu()
 
     for n in SCALES:
         print(f"\n>>> Benchmarking with {n:,} keys …")
         keys = make_keys(n)
-        for TreeClass in (BTree, RBTree):
+        for TreeClass in (BTree, RBTree, SortedDictTree):
             print(f"  • {TreeClass.__name__} …", end="", flush=True)
             res = bench_tree(TreeClass, keys, LOOKUPS)
             results.append(res)
             print(" done")
 
     # --- tabulate ---
-    df = pd.DataFrame(results)
-    print("\n" + df.to_string(index=False, float_format="{:0.2f}".format))
+    print("\n" + format_table(results))
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"CSV saved → {args.csv}")
+
+    plt = pyplot()
+
+    impls = list(dict.fromkeys(r["impl"] for r in results))
 
     # --- plotting insert times ---
     plt.figure(figsize=(6,4))
-    for impl in df['impl'].unique():
-        sub = df[df['impl'] == impl]
-        plt.plot(sub['n_keys'], sub['insert_p50_µs'], marker="o", label=f"{impl} insert")
+    for impl in impls:
+        sub = [r for r in results if r["impl"] == impl]
+        plt.plot([r["n_keys"] for r in sub], [r["insert_p50_µs"] for r in sub],
+                 marker="o", label=f"{impl} insert")
 
     plt.xscale("log"); plt.yscale("log")
     plt.xlabel("number of keys"); plt.ylabel("median insert latency (µs)")
-    plt.title("Insert latency: BTree vs. RBTree")
+    plt.title("Insert latency: BTree vs. RBTree vs. SortedDict")
     plt.legend(); plt.tight_layout()
     plt.savefig("compare_insert_latency.png")
 
     # --- plotting lookup times ---
     plt.figure(figsize=(6,4))
-    for impl in df['impl'].unique():
-        sub = df[df['impl'] == impl]
-        plt.plot(sub['n_keys'], sub['lookup_p50_µs'], marker="s", label=f"{impl} lookup")
+    for impl in impls:
+        sub = [r for r in results if r["impl"] == impl]
+        plt.plot([r["n_keys"] for r in sub], [r["lookup_p50_µs"] for r in sub],
+                 marker="s", label=f"{impl} lookup")
     plt.xscale("log"); plt.yscale("log")
     plt.xlabel("number of keys"); plt.ylabel("median lookup latency (µs)")
-    plt.title("Lookup latency: BTree vs. RBTree")
+    plt.title("Lookup latency: BTree vs. RBTree vs. SortedDict")
     plt.legend(); plt.tight_layout()
     plt.savefig("compare_lookup_latency.png")
 
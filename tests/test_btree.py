@@ -0,0 +1,10 @@
+from fs.index.btree import BTree
+
+
+def test_leaf_insert_keeps_values_aligned():
+    tree = BTree()
+    keys = [f"k{i:02d}" for i in range(50)]
+    for i, k in enumerate(reversed(keys)):
+        tree.insert(k, i)
+    assert list(tree.iter()) == keys
+    assert all(tree.get(k) == 49 - i for i, k in enumerate(keys))
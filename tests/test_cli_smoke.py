@@ -15,3 +15,21 @@ def test_cli_smoke(tmp_path):
     out = run(str(state_file), "read /a/x.txt")
     assert out == "hi"
 
+
+def test_read_only_commands_skip_save(tmp_path):
+    state_file = tmp_path / "vfs.pkl.gz"
+    run(str(state_file), "mkdir /a")
+    before = {f.name: f.stat().st_mtime_ns for f in tmp_path.iterdir()}
+    run(str(state_file), "ls /a")
+    assert {f.name: f.stat().st_mtime_ns for f in tmp_path.iterdir()} == before
+
+
+def test_repl_persists_implicit_dirs(tmp_path):
+    state_file = tmp_path / "vfs.pkl.gz"
+    subprocess.run(
+        [sys.executable, "-m", "fs.cli", "-s", str(state_file), "repl"],
+        input=b"read /nope/zz\nquit\n",
+        check=True,
+        stdout=subprocess.PIPE,
+    )
+    assert run(str(state_file), "ls /") == "nope"
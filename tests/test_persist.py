@@ -0,0 +1,96 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fs import persist
+from fs.exceptions import NotDirectory
+from fs.vfs import VFS
+
+LEGACY = Path(__file__).parent / "data" / "legacy_snapshot.pkl.gz"
+
+
+def test_save_load_roundtrip(tmp_path):
+    state = tmp_path / "vfs.pkl.gz"
+    vfs = VFS()
+    vfs.mkdir("/docs")
+    vfs.write("/docs/a.bin", bytes(range(256)))
+    persist.save(vfs, state)
+
+    loaded = persist.load(state)
+    assert loaded.ls("/docs") == ["a.bin"]
+    assert loaded.read("/docs/a.bin") == bytes(range(256))
+
+
+def test_load_legacy_gzip(tmp_path):
+    # written by the original gzip-pickle CLI: mkdir /docs, write
+    # /docs/a.txt hello, touch /docs/b.txt, mkdir /docs/sub, write /top.bin xyz
+    state = tmp_path / "old.pkl.gz"
+    shutil.copy(LEGACY, state)
+
+    vfs = persist.load(state)
+    assert vfs.ls("/") == ["docs", "top.bin"]
+    assert vfs.ls("/docs") == ["a.txt", "b.txt", "sub"]
+    assert vfs.read("/docs/a.txt") == b"hello"
+    assert vfs.read("/top.bin") == b"xyz"
+    assert isinstance(vfs.table.get(vfs.root_id).meta.created, int)
+
+    vfs.touch("/docs/c.txt")
+    persist.save(vfs, state)
+    assert persist.load(state).ls("/docs") == ["a.txt", "b.txt", "c.txt", "sub"]
+
+
+def test_op_log_replay_and_compaction(tmp_path):
+    state = tmp_path / "vfs.pkl.gz"
+    persist.append_op("mkdir", ("/a",), state)
+    persist.append_op("write", ("/a/x.txt", "hi"), state)
+    persist.append_op("rm", ("/a/x.txt",), state)
+    persist.append_op("touch", ("/a/y.txt",), state)
+
+    vfs = persist.load(state)
+    assert vfs.ls("/a") == ["y.txt"]
+    assert not vfs._dirty
+
+    persist.save(vfs, state)
+    assert not persist._log_path(state).exists()
+    assert persist.load(state).ls("/a") == ["y.txt"]
+
+
+def test_replay_tolerates_only_duplicate_ops(tmp_path):
+    state = tmp_path / "vfs.pkl.gz"
+    vfs = VFS()
+    vfs.mkdir("/a")
+    persist.save(vfs, state)
+    persist.append_op("mkdir", ("/a",), state)     # already in the snapshot
+    persist.append_op("rm", ("/b",), state)
+    persist.append_op("makedirs", ("/c/d",), state)
+    assert persist.load(state).ls("/c") == ["d"]
+
+    persist.append_op("write", ("/c", "x"), state)  # /c is a directory
+    with pytest.raises(NotDirectory):
+        persist.load(state)
+
+
+def test_file_contents_stored_out_of_band(tmp_path):
+    state = tmp_path / "vfs.pkl.gz"
+    payload = bytes(range(256)) * 4
+    vfs = VFS()
+    vfs.write("/blob.bin", payload)
+    file_id = vfs.table.get(vfs.root_id).get_child("blob.bin")
+    persist.save(vfs, state)
+
+    assert payload in state.read_bytes()      # raw, not zstd-compressed
+    node = persist.load(state).table.get(file_id)
+    assert node.content == payload
+    assert node.meta == vfs.table.get(file_id).meta
+
+
+def test_save_async(tmp_path):
+    state = tmp_path / "vfs.pkl.gz"
+    vfs = VFS()
+    vfs.write("/a.txt", "async")
+    persist.save_async(vfs, state)
+    persist.flush()
+
+    assert persist.load(state).read("/a.txt") == b"async"
+    assert not (tmp_path / "vfs.pkl.gz.tmp").exists()
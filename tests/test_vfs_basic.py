@@ -1,3 +1,6 @@
+import pytest
+
+from fs.exceptions import FileExists, FileNotFound, NotDirectory
 from fs.vfs import VFS
 
 def test_mkdir_touch_write_read_ls():
@@ -9,3 +12,69 @@ def test_mkdir_touch_write_read_ls():
     assert vfs.ls("/") == ["docs"]
     assert vfs.ls("/docs") == ["hello.txt"]
 
+
+def test_rm_invalidates_cached_lookups():
+    vfs = VFS()
+    vfs.write("/a/b/x.txt", "one")
+    assert vfs.read("/a/b/x.txt") == b"one"   # warm the caches
+    vfs.rm("/a/b/x.txt")
+    with pytest.raises(FileNotFound):
+        vfs.read("/a/b/x.txt")
+
+    vfs.rm("/a/b")
+    vfs.touch("/a/b")                         # same name, now a file
+    with pytest.raises(NotDirectory):
+        vfs.read("/a/b/x.txt")
+
+def test_failed_lookup_under_file_is_not_cached():
+    vfs = VFS()
+    vfs.write("/a/b", "file")
+    with pytest.raises(NotDirectory):
+        vfs.write("/a/b/c", "x")                # parent is a file
+    vfs.rm("/a/b")
+    vfs.mkdir("/a/b")
+    vfs.write("/a/b/c", "x")
+    assert vfs.read("/a/b/c") == b"x"
+
+def test_bulk_create():
+    vfs = VFS()
+    vfs.bulk_create([
+        ("/a/b", [("x.bin", b"x"), ("y.bin", b"y")]),
+        ("/c", []),
+    ])
+    assert vfs.ls("/") == ["a", "c"]
+    assert vfs.ls("/a/b") == ["x.bin", "y.bin"]
+    assert vfs.read("/a/b/y.bin") == b"y"
+
+def test_bulk_create_overwrites_like_write():
+    vfs = VFS()
+    vfs.write("/f", "1")
+    file_id = vfs.table.get(vfs.root_id).get_child("f")
+    vfs.mkdir("/a")
+    vfs.write("/a/x", "1")
+    assert vfs.read("/a/x") == b"1"
+
+    vfs.bulk_create([("/", [("f", b"2")])])
+    assert vfs.table.get(vfs.root_id).get_child("f") == file_id
+    assert vfs.read("/f") == b"2"
+    with pytest.raises(NotDirectory):
+        vfs.bulk_create([("/", [("a", b"f")])])
+    assert vfs.read("/a/x") == b"1"
+
+def test_touch_many():
+    vfs = VFS()
+    vfs.touch_many("/d", ["b", "a"])
+    assert vfs.ls("/d") == ["a", "b"]
+    assert vfs.read("/d/a") == b""
+    with pytest.raises(FileExists):
+        vfs.touch_many("/d", ["c", "a"])
+
+def test_write_at_rm_at():
+    vfs = VFS()
+    vfs.mkdir("/d")
+    d = vfs.table.get(vfs.table.get(vfs.root_id).get_child("d"))
+    vfs.write_at(d, "x.txt", "hi")
+    assert vfs.read("/d/x.txt") == b"hi"
+    vfs.rm_at(d, "x.txt")
+    with pytest.raises(FileNotFound):
+        vfs.read("/d/x.txt")